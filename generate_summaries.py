@@ -4,18 +4,30 @@ Boston.com Speed Read - News Summary Generator
 Fetches Boston.com RSS feeds and creates concise, non-clickbait summaries
 """
 
+import argparse
+import asyncio
 import json
 import os
 import sys
 import time
 import random
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import List, Dict, Optional, Tuple
 
-import feedparser
+import orjson
 import requests
-from openai import OpenAI
-from bs4 import BeautifulSoup
+import tiktoken
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from openai import AsyncOpenAI
+from selectolax.parser import HTMLParser
 
 # Configuration
 RSS_FEEDS = [
@@ -23,57 +35,131 @@ RSS_FEEDS = [
 ]
 
 MAX_ARTICLES = 12
-OPENAI_MODEL = "gpt-4"
+FEED_ENTRY_LIMIT = 15  # Get more from the main feed
+OPENAI_MODEL = "gpt-4o-mini"  # supports JSON mode; much faster and cheaper than gpt-4
 REQUEST_TIMEOUT = 30
 RETRY_ATTEMPTS = 3
+MAX_WORKERS = 8
+MAX_REQUESTS_PER_SECOND = 4  # politeness limit for Boston.com
+HTTP_POOL_SIZE = 50
+MAX_ARTICLE_BYTES = 250_000  # comfortably covers the article body on Boston.com templates
+MAX_CONCURRENT_SUMMARIES = 5
+MAX_CONTENT_TOKENS = 800  # article text sent to the model per story
+MAX_CONTENT_CHARS = MAX_CONTENT_TOKENS * 8  # generous bound applied before tokenizing
+TEASER_MIN_CHARS = 200  # RSS descriptions longer than this can stand in for the article
+TEASER_HOOK_TYPES = ("SPORTS", "WEATHER")
+TEASER_MAX_TOKENS = 150
+SUMMARY_CHUNK_SIZE = 5  # articles per chat.completions request
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_POLL_INITIAL = 5  # seconds
+BATCH_POLL_MAX = 60
+# Give up on the batch after this and fall back to direct requests. Batch
+# turnaround is often longer than this, in which case the run idles for the
+# whole window and then pays the synchronous price anyway; the scheduled
+# workflow passes --sync until real turnaround times have been measured
+BATCH_MAX_WAIT = 600
 
-class BostonNewsGenerator:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; BostonSpeedRead/1.0)'
-        })
-        
-    def fetch_article_content(self, url: str) -> Optional[str]:
-        """Extract article text from URL"""
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # Try to find article content
-            content = None
-            for selector in ['.entry-content', '.article-body', '.post-content', 'article']:
-                element = soup.select_one(selector)
-                if element:
-                    content = element.get_text(strip=True)
-                    break
-            
-            if not content:
-                # Fallback to all paragraphs
-                paragraphs = soup.find_all('p')
-                content = ' '.join([p.get_text(strip=True) for p in paragraphs[:10]])
-            
-            return content[:4000] if content else None
-            
-        except Exception as e:
-            print(f"Error fetching article content from {url}: {e}")
-            return None
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the model's tokenizer on first use (None if it can't be downloaded)"""
+    try:
+        return tiktoken.encoding_for_model(OPENAI_MODEL)
+    except Exception as e:
+        print(f"Could not load tiktoken encoding, trimming by characters: {e}")
+        return None
+
+def _truncate_tokens(text: str, limit: int = MAX_CONTENT_TOKENS) -> str:
+    """Cut text to at most `limit` model tokens"""
+    text = text[:limit * 8]
+    encoding = _get_encoding()
+    if encoding is None:
+        # Roughly four characters per token for English prose
+        return text[:limit * 4]
     
-    def create_summary(self, title: str, content: str, url: str) -> List[str]:
-        """Generate 3-bullet summary using OpenAI"""
-        
-        # Analyze content to create story-specific curiosity gaps
-        prompt = f"""You are creating a 3-bullet summary for a Boston news story. 
+    tokens = encoding.encode(text)
+    return text if len(tokens) <= limit else encoding.decode(tokens[:limit])
+
+def _write_json(path: str, data: Dict):
+    """Write pretty JSON via a temp file so readers never see a partial file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, path)
 
-STORY TITLE: {title}
-STORY CONTENT: {content[:2000]}
+# Title keywords per hook type, listed in priority order
+_SPORTS = ('patriots', 'celtics', 'bruins', 'red sox')
+_TRANSIT = ('mbta', 'orange line', 'green line', 'commuter rail', 'traffic')
+_POLITICS = ('mayor', 'city council', 'election', 'vote')
+_WEATHER = ('weather', 'storm', 'snow', 'rain')
+_HOOK_KEYWORDS = (("SPORTS", _SPORTS), ("TRANSIT", _TRANSIT), ("POLITICS", _POLITICS), ("WEATHER", _WEATHER))
+# Content keywords; only checked when no title category matched
+_LOCAL = ('boston', 'cambridge', 'somerville', 'brookline')
+
+def _keyword_pattern(words) -> str:
+    return "|".join(re.escape(word) for word in words)
+
+# Matching rules: case-insensitive, and a keyword must start a word but may
+# carry any suffix, so "storms", "snowstorm", "rainfall", "voters", "elections"
+# and "mayoral" all count, while "training" and "Ukraine" don't match "rain"
+_HOOK_RE = re.compile(
+    r"\b(?:" + "|".join(f"(?P<{hook}>{_keyword_pattern(words)})" for hook, words in _HOOK_KEYWORDS) + r")\w*",
+    re.IGNORECASE
+)
+_HOOK_PRIORITY = tuple(hook for hook, _ in _HOOK_KEYWORDS)
+_LOCAL_RE = re.compile(r"\b(?:" + _keyword_pattern(_LOCAL) + r")\w*", re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def _classify_hook(title: str, content: str) -> str:
+    """Hook type for a title/content pair, memoized across repeated lookups"""
+    # One scan of the title; earlier categories win when several match
+    found = {match.lastgroup for match in _HOOK_RE.finditer(title)}
+    for hook_type in _HOOK_PRIORITY:
+        if hook_type in found:
+            return hook_type
+    
+    if _LOCAL_RE.search(content):
+        return "LOCAL_IMPACT"
+    return "NEWS"
+
+# Leading "•", "*", "-" or "1." markers the model sometimes keeps inside JSON
+# bullets; "-" and "1." need trailing whitespace so "-5 degrees" and
+# "2.5 million" survive
+_BULLET_RE = re.compile(r"^\s*(?:[\u2022*]\s*|(?:-|\d+\.)\s+)?(.*?)\s*$", re.DOTALL)
+
+# Placeholder bullets written after a failed OpenAI call; records saved before
+# the summaryFallback flag existed are recognized by these first-bullet prefixes
+_PLACEHOLDER_PREFIXES = ("Breaking news from Boston: ", "Boston news update: ")
+
+class FeedEntry(SimpleNamespace):
+    """RSS item exposing feedparser-style attribute and .get() access"""
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter allowing `calls` per `period` seconds"""
+    def __init__(self, calls: int, period: float):
+        self.calls = calls
+        self.period = period
+        self.timestamps = deque()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block only while the last `period` seconds already used every call"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.timestamps and now - self.timestamps[0] >= self.period:
+                    self.timestamps.popleft()
+                if len(self.timestamps) < self.calls:
+                    self.timestamps.append(now)
+                    return
+                wait = self.period - (now - self.timestamps[0])
+            time.sleep(wait)
+
+class BostonNewsGenerator:
+    # Static instructions live in the system message so every request shares an
+    # identical prefix that OpenAI's prompt cache can reuse; keep it stable
+    SYSTEM_PROMPT = """You are an expert at creating concise, factual news summaries of Boston news stories that avoid clickbait while still being compelling.
 
 Create exactly 3 bullets following these rules:
 
@@ -95,119 +181,460 @@ Examples of BAD bullet 3s (generic templates):
 
 Be specific to THIS story. What unique, substantive detail or question would genuinely intrigue readers?
 
-Format as three separate lines, each starting with a bullet point."""
+If you are given a single story, respond with JSON: {"bullets": ["...", "...", "..."]}
 
+If you are given several numbered articles, summarize each one independently and respond with JSON: {"summaries": [{"id": 1, "bullets": ["...", "...", "..."]}, ...]} with one entry per article, using the article number as the id."""
+    
+    # Article extraction selectors, built once rather than per article
+    STRIP_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside']
+    CONTENT_SELECTORS = ('.entry-content', '.article-body', '.post-content', 'article')
+    
+    def __init__(self, api_key: str, use_batch: bool = True):
+        self.use_batch = use_batch
+        # news-history.json is parsed once per run and kept in memory
+        self.history: Optional[Dict] = None
+        self.aclient = AsyncOpenAI(api_key=api_key)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (compatible; BostonSpeedRead/1.0)'
+        })
+        # Reuse pooled connections across parallel fetches and retry transient failures
+        retry = Retry(
+            total=RETRY_ATTEMPTS,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET'])
+        )
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Throttle requests to Boston.com while workers run in parallel
+        self.rate_limiter = RateLimiter(MAX_REQUESTS_PER_SECOND, 1)
+        # Bound concurrent OpenAI requests to respect RPM limits
+        self.summary_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+        
+    def _get(self, url: str) -> requests.Response:
+        """Rate-limited streaming GET shared by feed and article fetches"""
+        self.rate_limiter.acquire()
+        return self.session.get(url, timeout=REQUEST_TIMEOUT, stream=True)
+    
+    def fetch_feed(self, feed_url: str) -> List[FeedEntry]:
+        """Stream an RSS feed and extract the first FEED_ENTRY_LIMIT items"""
+        entries = []
+        response = self._get(feed_url)
         try:
-            response = self.client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are an expert at creating concise, factual news summaries that avoid clickbait while still being compelling."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.7
-            )
+            response.raise_for_status()
+            response.raw.decode_content = True
             
-            summary_text = response.choices[0].message.content.strip()
+            for _, elem in etree.iterparse(response.raw, tag="item"):
+                entry = FeedEntry(
+                    title=(elem.findtext("title") or "").strip(),
+                    link=(elem.findtext("link") or "").strip(),
+                    published=elem.findtext("pubDate") or "",
+                    summary=elem.findtext("description") or ""
+                )
+                elem.clear()
+                if not entry.link:
+                    continue
+                
+                entries.append(entry)
+                if len(entries) >= FEED_ENTRY_LIMIT:
+                    break
+        finally:
+            response.close()
+        
+        return entries
+    
+    def fetch_article_content(self, url: str) -> Optional[str]:
+        """Extract article text from URL"""
+        try:
+            # Only read the start of the page; trailing markup (comments, related
+            # stories, trackers) is never needed for the summary excerpt
+            response = self._get(url)
+            try:
+                response.raise_for_status()
+                html = response.raw.read(MAX_ARTICLE_BYTES, decode_content=True)
+            finally:
+                response.close()
             
-            # Parse bullets
-            bullets = []
-            for line in summary_text.split('\n'):
-                line = line.strip()
-                if line and any(line.startswith(prefix) for prefix in ['•', '-', '*', '1.', '2.', '3.']):
-                    # Clean up bullet formatting
-                    clean_line = line
-                    for prefix in ['•', '-', '*', '1.', '2.', '3.']:
-                        if clean_line.startswith(prefix):
-                            clean_line = clean_line[len(prefix):].strip()
-                            break
-                    bullets.append(clean_line)
+            tree = HTMLParser(html)
             
-            # Ensure we have exactly 3 bullets
+            # Remove unwanted elements, freeing their whole subtrees
+            tree.strip_tags(self.STRIP_TAGS, recursive=True)
+            
+            # Try to find article content
+            content = None
+            for selector in self.CONTENT_SELECTORS:
+                node = tree.css_first(selector)
+                if node:
+                    content = node.text(strip=True)
+                    break
+            
+            if not content:
+                # Fallback to all paragraphs
+                paragraphs = tree.css('p')
+                content = ' '.join(p.text(strip=True) for p in paragraphs[:10])
+            
+            return content[:MAX_CONTENT_CHARS] if content else None
+            
+        except Exception as e:
+            print(f"Error fetching article content from {url}: {e}")
+            return None
+    
+    def _summary_request(self, title: str, content: str) -> Dict:
+        """Build the chat.completions arguments for a single article"""
+        return {
+            "model": OPENAI_MODEL,
+            "messages": [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": f"TITLE: {title}\nCONTENT: {_truncate_tokens(content)}"}
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": 200,
+            "temperature": 0.7
+        }
+    
+    def _packed_summary_request(self, items: List[Tuple[str, str, str]]) -> Dict:
+        """Build one JSON-mode chat.completions request covering several articles"""
+        articles = "\n\n".join(
+            f"### Article {i}\nTITLE: {title}\nCONTENT: {_truncate_tokens(content)}"
+            for i, (title, content, _) in enumerate(items, 1)
+        )
+        
+        return {
+            "model": OPENAI_MODEL,
+            "messages": [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": articles}
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": 200 * len(items),
+            "temperature": 0.7
+        }
+    
+    def _clean_bullets(self, bullets) -> List[str]:
+        """Normalize the bullets array from a JSON-mode reply"""
+        # A bare string would otherwise be iterated character by character, and
+        # null/object items would be published as "None" or a dict repr
+        if not isinstance(bullets, list):
+            return []
+        cleaned = (_BULLET_RE.match(bullet).group(1) for bullet in bullets if isinstance(bullet, str))
+        return [bullet for bullet in cleaned if bullet]
+    
+    def _parse_summary(self, summary_text: str, title: str) -> Optional[List[str]]:
+        """Turn the model's JSON reply into exactly 3 bullets (None if unusable)"""
+        try:
+            bullets = self._clean_bullets(json.loads(summary_text)["bullets"])
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Could not parse summary for {title}: {e}")
+            bullets = []
+        
+        # Ensure we have exactly 3 bullets
+        return bullets[:3] if len(bullets) >= 3 else None
+    
+    def _parse_packed_summaries(self, summary_text: str, count: int) -> List[Optional[List[str]]]:
+        """Map a JSON-mode reply back to per-article bullets (None where missing)"""
+        try:
+            summaries = json.loads(summary_text)["summaries"]
+            ids = [summary["id"] for summary in summaries]
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Could not parse packed summaries: {e}")
+            return [None] * count
+        
+        # Bullets must never land under the wrong headline, so unless the ids are
+        # exactly 1..count the whole chunk is re-requested one article at a time
+        if (any(type(article_id) is not int for article_id in ids)
+                or len(ids) != count or set(ids) != set(range(1, count + 1))):
+            print(f"Packed summaries have unexpected ids {ids!r}, expected 1..{count}")
+            return [None] * count
+        
+        bullets_by_id = {}
+        for summary in summaries:
+            bullets = self._clean_bullets(summary.get("bullets", []))
             if len(bullets) >= 3:
-                return bullets[:3]
-            else:
-                # Fallback if parsing failed
-                return [
-                    f"Breaking news from Boston: {title}",
-                    "Story developing with local impact",
-                    f"Full details and context available at Boston.com"
-                ]
+                bullets_by_id[summary["id"]] = bullets[:3]
+        
+        return [bullets_by_id.get(i) for i in range(1, count + 1)]
+    
+    def _teaser_summary_request(self, title: str, teaser: str) -> Dict:
+        """Build a short chat.completions request that summarizes from the RSS teaser"""
+        return {
+            "model": OPENAI_MODEL,
+            "messages": [
+                {"role": "system", "content": 'Turn this Boston news teaser into exactly 3 concise, factual, non-clickbait bullets. Respond with JSON: {"bullets": ["...", "...", "..."]}'},
+                {"role": "user", "content": f"TITLE: {title}\nTEASER: {teaser}"}
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": TEASER_MAX_TOKENS,
+            "temperature": 0.7
+        }
+    
+    async def _complete_summary(self, request: Dict, title: str) -> Optional[List[str]]:
+        """Send one single-article summary request and parse the reply"""
+        try:
+            async with self.summary_semaphore:
+                response = await self.aclient.chat.completions.create(**request)
+            
+            return self._parse_summary(response.choices[0].message.content, title)
                 
         except Exception as e:
             print(f"Error generating summary for {title}: {e}")
-            return [
-                f"Boston news update: {title}",
-                "Local story with community impact", 
-                "Additional details in full article"
+            return None
+    
+    async def create_summary(self, title: str, content: str, url: str) -> Optional[List[str]]:
+        """Generate 3-bullet summary using OpenAI (None if the request failed)"""
+        return await self._complete_summary(self._summary_request(title, content), title)
+    
+    async def create_teaser_summary(self, title: str, teaser: str) -> Optional[List[str]]:
+        """Generate a 3-bullet summary from the RSS teaser alone"""
+        return await self._complete_summary(self._teaser_summary_request(title, teaser), title)
+    
+    async def _fill_missing_summaries(self, items: List[Tuple[str, str, str]],
+                                      summaries: List[Optional[List[str]]]) -> List[Optional[List[str]]]:
+        """Summarize one at a time any article a packed request did not cover"""
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        retried = await asyncio.gather(*(self.create_summary(*items[i]) for i in missing))
+        for i, summary in zip(missing, retried):
+            summaries[i] = summary
+        return summaries
+    
+    async def _create_chunk_summaries(self, chunk: List[Tuple[str, str, str]]) -> List[Optional[List[str]]]:
+        """Send one packed request for a chunk of articles"""
+        try:
+            async with self.summary_semaphore:
+                response = await self.aclient.chat.completions.create(
+                    **self._packed_summary_request(chunk)
+                )
+            return self._parse_packed_summaries(response.choices[0].message.content, len(chunk))
+        except Exception as e:
+            print(f"Error generating summaries for {len(chunk)} articles: {e}")
+            return [None] * len(chunk)
+    
+    async def create_summaries_batch(self, items: List[Tuple[str, str, str]]) -> List[Optional[List[str]]]:
+        """Generate summaries for (title, content, url) items, SUMMARY_CHUNK_SIZE per request"""
+        chunks = [items[i:i + SUMMARY_CHUNK_SIZE] for i in range(0, len(items), SUMMARY_CHUNK_SIZE)]
+        results = await asyncio.gather(*(self._create_chunk_summaries(chunk) for chunk in chunks))
+        
+        summaries = [summary for chunk_summaries in results for summary in chunk_summaries]
+        return await self._fill_missing_summaries(items, summaries)
+    
+    async def _wait_for_batch(self, batch_id: str):
+        """Poll a batch with exponential backoff until it completes"""
+        delay = BATCH_POLL_INITIAL
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        
+        while True:
+            batch = await self.aclient.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                return batch
+            if batch.status in ("failed", "expired", "cancelling", "cancelled"):
+                raise RuntimeError(f"batch {batch_id} ended with status {batch.status}")
+            if time.monotonic() >= deadline:
+                await self.aclient.batches.cancel(batch_id)
+                raise TimeoutError(f"batch {batch_id} still {batch.status} after {BATCH_MAX_WAIT}s")
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX)
+    
+    async def create_summaries_via_batch(self, items: List[Tuple[str, str, str]]) -> List[Optional[List[str]]]:
+        """Generate summaries for (title, content, url) items through the OpenAI Batch API"""
+        chunks = [items[i:i + SUMMARY_CHUNK_SIZE] for i in range(0, len(items), SUMMARY_CHUNK_SIZE)]
+        results = {}
+        file_ids = []
+        
+        try:
+            lines = [
+                json.dumps({
+                    "custom_id": f"chunk-{n}",
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": self._packed_summary_request(chunk)
+                }, ensure_ascii=False)
+                for n, chunk in enumerate(chunks)
             ]
+            batch_file = await self.aclient.files.create(
+                file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            file_ids.append(batch_file.id)
+            batch = await self.aclient.batches.create(
+                input_file_id=batch_file.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window="24h"
+            )
+            print(f"Submitted batch {batch.id} with {len(lines)} requests")
+            
+            batch = await self._wait_for_batch(batch.id)
+            file_ids.extend(file_id for file_id in (batch.output_file_id, batch.error_file_id) if file_id)
+            output = await self.aclient.files.content(batch.output_file_id)
+            
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if result.get("error") or response.get("status_code") != 200:
+                    print(f"Batch request failed for {result.get('custom_id')}: {result.get('error')}")
+                    continue
+                results[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+                
+        except Exception as e:
+            print(f"Batch summarization failed, falling back to direct requests: {e}")
+        finally:
+            # Don't leave batch input/output files piling up in the OpenAI account
+            for file_id in file_ids:
+                try:
+                    await self.aclient.files.delete(file_id)
+                except Exception as e:
+                    print(f"Could not delete batch file {file_id}: {e}")
+        
+        summaries = []
+        for n, chunk in enumerate(chunks):
+            if f"chunk-{n}" in results:
+                summaries.extend(self._parse_packed_summaries(results[f"chunk-{n}"], len(chunk)))
+            else:
+                summaries.extend([None] * len(chunk))
+        
+        # Anything the batch did not return is summarized directly
+        return await self._fill_missing_summaries(items, summaries)
     
     def determine_hook_type(self, title: str, content: str) -> str:
         """Determine the story type/hook"""
-        title_lower = title.lower()
-        content_lower = content.lower() if content else ""
-        
-        if any(word in title_lower for word in ['patriots', 'celtics', 'bruins', 'red sox']):
-            return "SPORTS"
-        elif any(word in title_lower for word in ['mbta', 'orange line', 'green line', 'commuter rail', 'traffic']):
-            return "TRANSIT"
-        elif any(word in title_lower for word in ['mayor', 'city council', 'election', 'vote']):
-            return "POLITICS"
-        elif any(word in title_lower for word in ['weather', 'storm', 'snow', 'rain']):
-            return "WEATHER"
-        elif any(word in content_lower for word in ['boston', 'cambridge', 'somerville', 'brookline']):
-            return "LOCAL_IMPACT"
-        else:
-            return "NEWS"
+        return _classify_hook(title, content or "")
+    
+    def _usable_teaser(self, entry) -> Optional[str]:
+        """Return the RSS teaser text when it is enough to summarize from"""
+        tree = HTMLParser(entry.get('summary', '') or '')
+        teaser = tree.body.text(separator=' ', strip=True) if tree.body else ''
+        
+        if len(teaser) > TEASER_MIN_CHARS and self.determine_hook_type(entry.title, teaser) in TEASER_HOOK_TYPES:
+            return teaser
+        return None
+    
+    async def _fetch_content_async(self, entry, executor: ThreadPoolExecutor) -> str:
+        """Get article content, falling back to the RSS summary"""
+        # Blocking HTTP + parsing runs in the thread pool
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(executor, self.fetch_article_content, entry.link)
+        return content or entry.get('summary', '')
+    
+    def _build_article(self, entry, content: str, summary: Optional[List[str]]) -> Dict:
+        """Assemble the article record stored in the JSON output"""
+        article = {
+            "title": entry.title,
+            "link": entry.link,
+            "pubDate": entry.get('published', ''),
+            "summary": summary,
+            "hookType": self.determine_hook_type(entry.title, content),
+            "processed_at": datetime.now(timezone.utc).isoformat()
+        }
+        if summary is None:
+            # Placeholder bullets; flagged so the next run summarizes it again
+            article["summary"] = [
+                f"Boston news update: {entry.title}",
+                "Local story with community impact",
+                "Additional details in full article"
+            ]
+            article["summaryFallback"] = True
+        print(f"Processed: {entry.title[:60]}...")
+        return article
+    
+    async def _summarize_articles(self, items: List[Tuple[str, str, str]]) -> List[Optional[List[str]]]:
+        """Summarize full articles through the Batch API or packed direct requests"""
+        if not items:
+            return []
+        if self.use_batch:
+            return await self.create_summaries_via_batch(items)
+        return await self.create_summaries_batch(items)
+    
+    async def _run_all(self, entries) -> List[Dict]:
+        """Fetch all entries concurrently, then summarize them in one pass"""
+        # Simple stories with a substantive teaser skip the article fetch and full prompt
+        teasers = [self._usable_teaser(entry) for entry in entries]
+        teaser_items = [(entry, teaser) for entry, teaser in zip(entries, teasers) if teaser]
+        full_entries = [entry for entry, teaser in zip(entries, teasers) if not teaser]
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            contents = await asyncio.gather(*(
+                self._fetch_content_async(entry, executor) for entry in full_entries
+            ))
+        full_items = list(zip(full_entries, contents))
+        
+        summaries, teaser_summaries = await asyncio.gather(
+            self._summarize_articles([(entry.title, content, entry.link) for entry, content in full_items]),
+            asyncio.gather(*(self.create_teaser_summary(entry.title, teaser) for entry, teaser in teaser_items))
+        )
+        
+        return [
+            self._build_article(entry, content, summary)
+            for (entry, content), summary in zip(full_items + teaser_items, summaries + teaser_summaries)
+        ]
+    
+    def _fetch_feed_safe(self, feed_url: str) -> List[FeedEntry]:
+        """fetch_feed that logs failures so one bad feed doesn't stop the others"""
+        try:
+            print(f"Fetching feed: {feed_url}")
+            return self.fetch_feed(feed_url)
+        except Exception as e:
+            print(f"Error processing feed {feed_url}: {e}")
+            return []
+    
+    def _is_placeholder(self, article: Dict) -> bool:
+        """Whether a stored article only carries placeholder bullets"""
+        if article.get("summaryFallback"):
+            return True
+        summary = article.get("summary")
+        return not summary or str(summary[0]).startswith(_PLACEHOLDER_PREFIXES)
     
     def fetch_and_process_feeds(self) -> List[Dict]:
         """Fetch articles from RSS feeds and process them"""
+        # Articles summarized in earlier runs are reused instead of re-fetched,
+        # except placeholder summaries left by a failed OpenAI call (see _is_placeholder)
+        known_articles = {article["link"]: article for article in self.load_history().get("articles", [])}
+        
+        entries = []
         all_articles = []
         seen_urls = set()
         
-        for feed_url in RSS_FEEDS:
-            try:
-                print(f"Fetching feed: {feed_url}")
-                feed = feedparser.parse(feed_url)
+        # Fetch every feed at once; results come back in RSS_FEEDS order
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            feeds = list(executor.map(self._fetch_feed_safe, RSS_FEEDS))
+        
+        # Deduplicate before submission so seen_urls stays single-threaded
+        for feed_entries in feeds:
+            for entry in feed_entries:
+                if entry.link in seen_urls:
+                    continue
+                seen_urls.add(entry.link)
                 
-                for entry in feed.entries[:15]:  # Get more from the main feed
-                    if entry.link in seen_urls:
-                        continue
-                    
-                    seen_urls.add(entry.link)
-                    
-                    # Get article content
-                    content = self.fetch_article_content(entry.link)
-                    if not content:
-                        content = entry.get('summary', '')
-                    
-                    # Create summary
-                    summary = self.create_summary(entry.title, content, entry.link)
-                    hook_type = self.determine_hook_type(entry.title, content)
-                    
-                    article = {
-                        "title": entry.title,
-                        "link": entry.link,
-                        "pubDate": entry.get('published', ''),
-                        "summary": summary,
-                        "hookType": hook_type,
-                        "processed_at": datetime.now(timezone.utc).isoformat()
-                    }
-                    
+                known = known_articles.get(entry.link)
+                if known and not self._is_placeholder(known):
+                    article = dict(known)
+                    article.update(title=entry.title, pubDate=entry.get('published', ''))
                     all_articles.append(article)
-                    print(f"Processed: {entry.title[:60]}...")
-                    
-                    # Add small delay to be respectful
-                    time.sleep(1)
-                    
-            except Exception as e:
-                print(f"Error processing feed {feed_url}: {e}")
-                continue
+                    print(f"Reusing summary: {entry.title[:60]}...")
+                    continue
+                
+                entries.append(entry)
+        
+        # One event loop for every feed so the AsyncOpenAI client is reused safely
+        if entries:
+            all_articles.extend(asyncio.run(self._run_all(entries)))
         
         # Sort by publication date and limit
         all_articles.sort(key=lambda x: x.get('pubDate', ''), reverse=True)
         return all_articles[:MAX_ARTICLES]
     
+    def load_history(self) -> Dict:
+        """Load previously published articles from news-history.json"""
+        if self.history is None:
+            try:
+                with open("news-history.json", "rb") as f:
+                    self.history = orjson.loads(f.read())
+            except FileNotFoundError:
+                self.history = {"articles": [], "totalArticles": 0}
+        return self.history
+    
     def save_data(self, articles: List[Dict]):
         """Save processed articles to JSON files"""
         current_time = datetime.now(timezone.utc).isoformat()
@@ -223,33 +650,43 @@ Format as three separate lines, each starting with a bullet point."""
             }
         }
         
-        with open("news-data.json", "w", encoding="utf-8") as f:
-            json.dump(news_data, f, indent=2, ensure_ascii=False)
+        _write_json("news-data.json", news_data)
         
-        # Load existing history
-        try:
-            with open("news-history.json", "r", encoding="utf-8") as f:
-                history = json.load(f)
-        except FileNotFoundError:
-            history = {"articles": [], "totalArticles": 0}
+        # Existing history (already in memory from fetch_and_process_feeds)
+        history = self.load_history()
         
-        # Add new articles to history (avoid duplicates)
-        existing_links = {article["link"] for article in history.get("articles", [])}
-        new_articles = [article for article in articles if article["link"] not in existing_links]
+        # Add new articles to history, newest first; keying by link dedupes in
+        # one pass and the dict keeps insertion order
+        previous = history.get("articles", [])
+        old_links = {article["link"] for article in previous}
+        merged = {article["link"]: article for article in articles}
+        new_count = sum(link not in old_links for link in merged)
+        for article in previous:
+            merged.setdefault(article["link"], article)
         
-        history["articles"] = new_articles + history.get("articles", [])
-        history["articles"] = history["articles"][:50]  # Keep last 50
+        history["articles"] = list(merged.values())[:50]  # Keep last 50
         history["lastUpdated"] = current_time
         history["totalArticles"] = len(history["articles"])
         
-        with open("news-history.json", "w", encoding="utf-8") as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        _write_json("news-history.json", history)
         
-        print(f"Saved {len(articles)} articles ({len(new_articles)} new)")
+        print(f"Saved {len(articles)} articles ({new_count} new)")
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Generate Boston.com Speed Read summaries")
+    parser.add_argument("--sync", action="store_true",
+                        help="call chat.completions directly instead of the OpenAI Batch API")
+    args = parser.parse_args()
+    
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("ERROR: OPENAI_API_KEY environment variable not set")
         sys.exit(1)
+    
+    generator = BostonNewsGenerator(api_key, use_batch=not args.sync)
+    articles = generator.fetch_and_process_feeds()
+    generator.save_data(articles)
+
+if __name__ == "__main__":
+    main()